@@ -1,66 +1,373 @@
 import os
+import functools
+import asyncio
+import atexit
+import contextlib
 import json
 import logging
+import logging.handlers
+import queue
+import re
+import threading
+import zlib
 from datetime import datetime, timedelta, time
+from time import time as unix_time
 from dotenv import load_dotenv
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-from telegram.ext import Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters
-import traceback
-
-# Set up logging
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO,
-    filename='bot_log.log'
-)
+from telegram.error import Forbidden
+from telegram.ext import AIORateLimiter, Application, CommandHandler, MessageHandler, CallbackQueryHandler, filters
+
+def _json_default(obj):
+    """Serialize the in-memory-only types we keep in progress data"""
+    if isinstance(obj, set):
+        return sorted(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+# orjson is much faster than the stdlib json module; fall back if it's not installed
+try:
+    import orjson
+
+    def _json_loads(raw):
+        return orjson.loads(raw)
+
+    def _json_dumps(data):
+        return orjson.dumps(data, default=_json_default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _json_loads(raw):
+        return json.loads(raw)
+
+    def _json_dumps(data):
+        return json.dumps(data, default=_json_default, indent=2, ensure_ascii=False).encode('utf-8')
+
+# Set up logging: handlers only enqueue records, a background thread writes them to the file
+_log_queue = queue.Queue(-1)
+_log_file_handler = logging.FileHandler('bot_log.log')
+_log_file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_file_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logging.getLogger().addHandler(logging.handlers.QueueHandler(_log_queue))
+logging.getLogger().setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Load environment variables from .env file
-load_dotenv()
+@functools.cache
+def _bot_token():
+    """Load .env once and return the bot token from the environment"""
+    load_dotenv()
+    token = os.getenv('BOT_TOKEN')
+    if not token:
+        raise ValueError("No BOT_TOKEN found in environment variables! Create a .env file with BOT_TOKEN=your_token")
+    return token
+
+# All bot state lives in one JSON file: {"syllabi": {...}, "progress": {...}, "subscribed_chats": [...]} 🗃️
+# Mutations only touch the in-memory copy and are flushed together at most once per
+# FLUSH_INTERVAL, so the file stays hand-editable without a rewrite per change
+STATE_FILE = 'state.json'
+# Files used before syllabi and progress were merged; read once to migrate them
+LEGACY_SYLLABI_FILE = 'syllabi.json'
+LEGACY_PROGRESS_FILE = 'progress.json'
+
+# In-memory copy of the state file, invalidated when the file's mtime changes
+# "dirty" marks changes that haven't been written to disk yet
+# "hash" is of the bytes last read or written, so saves that change nothing skip the write
+_STATE_CACHE = {"mtime": None, "data": None, "dirty": False, "hash": None}
+# Values derived from the syllabi section, rebuilt whenever it changes
+_SYLLABI_CACHE = {"version": 0, "labels": {}, "rendered_tasks": {}, "fields": [], "fields_tag": "", "tasks": {}, "task_counts": {}}
 
-# Get bot token from environment variables
-BOT_TOKEN = os.getenv('BOT_TOKEN')
-if not BOT_TOKEN:
-    raise ValueError("No BOT_TOKEN found in environment variables! Create a .env file with BOT_TOKEN=your_token")
+FLUSH_INTERVAL = 1.0  # Seconds between checks for unsaved state; bursts of saves become one write
 
-# Load syllabi from JSON file 📂
-def load_syllabi():
+def _file_mtime(path):
+    """Return the file's mtime in nanoseconds, or None if it doesn't exist"""
     try:
-        with open('syllabi.json', 'r') as f:
-            return json.load(f)
+        return os.stat(path).st_mtime_ns
     except FileNotFoundError:
-        return {"current_field": "", "syllabi": {}}
+        return None
 
-def save_syllabi(data):
-    with open('syllabi.json', 'w') as f:
-        json.dump(data, f, indent=4)
+def _write_atomic(path, payload):
+    """Write the payload to a temp file and swap it in, so a crash never leaves a half-written file"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
 
-# Progress tracking 📊
-def load_progress():
+def _cache_syllabi(data):
+    """Rebuild the values derived from freshly read or saved syllabi"""
+    _SYLLABI_CACHE["version"] += 1  # Invalidates memoized keyboards
+    _SYLLABI_CACHE["labels"] = {
+        field: f"{field} (Paused ⏸️)" if syllabus.get("paused", False) else f"{field} (Active ▶️)"
+        for field, syllabus in data["syllabi"].items()
+    }
+    _SYLLABI_CACHE["rendered_tasks"] = {
+        field: "\n".join(f"{i+1}. {task}" for i, task in enumerate(syllabus["tasks"]))
+        for field, syllabus in data["syllabi"].items()
+    }
+    # Buttons carry the field's index so callback_data stays short for long syllabus names
+    _SYLLABI_CACHE["fields"] = list(data["syllabi"])
+    # ...plus a tag of the field list, so buttons from before an add/remove/reorder are rejected
+    _SYLLABI_CACHE["fields_tag"] = format(zlib.crc32("\n".join(_SYLLABI_CACHE["fields"]).encode()), "x")
+    # Task lists as tuples, plus their lengths, so handlers skip the nested lookups
+    _SYLLABI_CACHE["tasks"] = {field: tuple(syllabus["tasks"]) for field, syllabus in data["syllabi"].items()}
+    _SYLLABI_CACHE["task_counts"] = {field: len(tasks) for field, tasks in _SYLLABI_CACHE["tasks"].items()}
+
+def _read_legacy_file(path, default):
+    """Parse a pre-merge JSON file, or return the default if it doesn't exist"""
     try:
-        with open('progress.json', 'r') as f:
-            data = json.load(f)
-            # Initialize global settings if not present
-            if "global_settings" not in data:
-                data["global_settings"] = {
-                    "reminder_interval": 7,  # Default 7 days per task
-                    "reminders_enabled": True,  # Notifications enabled by default
-                    "last_check": datetime.now().isoformat()
-                }
-            return data
+        with open(path, 'rb') as f:
+            return _json_loads(f.read())
     except FileNotFoundError:
-        return {
-            "global_settings": {
-                "reminder_interval": 7,  # Default 7 days per task
-                "reminders_enabled": True,  # Notifications enabled by default
-                "last_check": datetime.now().isoformat()
-            },
-            "syllabi_progress": {}  # Will store progress for each syllabus separately
+        return default
+
+def _default_global_settings():
+    """Settings for a progress record that doesn't have any yet"""
+    return {
+        "reminder_interval": 7,  # Default 7 days per task
+        "reminders_enabled": True,  # Notifications enabled by default
+        "last_check": datetime.now()
+    }
+
+# Timestamps are kept as datetime in memory and written back as ISO text
+SETTINGS_DATE_FIELDS = ("last_check", "last_reminder")
+PROGRESS_DATE_FIELDS = ("start_date", "due_date")
+
+def _decode_progress(progress):
+    """Convert freshly parsed progress to its in-memory form: sets, int keys and datetimes"""
+    settings = progress["global_settings"]
+    for key in SETTINGS_DATE_FIELDS:
+        if isinstance(settings.get(key), str):
+            settings[key] = datetime.fromisoformat(settings[key])
+    for syllabus_progress in progress.get("syllabi_progress", {}).values():
+        syllabus_progress["completed_weeks"] = set(syllabus_progress.get("completed_weeks", ()))
+        # Completion dates are keyed by task index; JSON only stores string keys
+        syllabus_progress["completion_dates"] = {
+            int(k): datetime.fromisoformat(v) for k, v in syllabus_progress.get("completion_dates", {}).items()
         }
+        for key in PROGRESS_DATE_FIELDS:
+            if isinstance(syllabus_progress.get(key), str):
+                syllabus_progress[key] = datetime.fromisoformat(syllabus_progress[key])
+        # due_ts is derived from due_date here and never saved, so a hand-edited due_date is honoured
+        syllabus_progress.pop("due_ts", None)
+        if "due_date" in syllabus_progress:
+            syllabus_progress["due_ts"] = int(syllabus_progress["due_date"].timestamp())
 
+def _encode_state(data):
+    """Serialize the state for state.json, leaving out the in-memory due_ts"""
+    progress = data["progress"]
+    records = {
+        field: {key: value for key, value in syllabus_progress.items() if key != "due_ts"}
+        for field, syllabus_progress in progress.get("syllabi_progress", {}).items()
+    }
+    return _json_dumps({**data, "progress": {**progress, "syllabi_progress": records}})
+
+# Load the combined state file 📂
+def load_state():
+    # Unflushed changes in memory are newer than whatever is on disk
+    if _STATE_CACHE["dirty"]:
+        return _STATE_CACHE["data"]
+    # A new mtime while our own writes are still queued isn't a hand edit; memory is already newer
+    if _STATE_CACHE["data"] is not None and _write_queue.unfinished_tasks:
+        return _STATE_CACHE["data"]
+    mtime = _file_mtime(STATE_FILE)
+    if mtime is not None and _STATE_CACHE["mtime"] == mtime:
+        return _STATE_CACHE["data"]
+    try:
+        with open(STATE_FILE, 'rb') as f:
+            raw = f.read()
+        raw_hash = hash(raw)
+        # The bytes we last wrote: keep the cached copy rather than parsing it back
+        if _STATE_CACHE["data"] is not None and raw_hash == _STATE_CACHE["hash"]:
+            _STATE_CACHE["mtime"] = mtime
+            return _STATE_CACHE["data"]
+        data = _json_loads(raw)
+        _STATE_CACHE["hash"] = raw_hash
+    except FileNotFoundError:
+        # First run after the merge (or a fresh install): build the state from the old files
+        data = {
+            "syllabi": _read_legacy_file(LEGACY_SYLLABI_FILE, {"current_field": "", "syllabi": {}}),
+            # syllabi_progress will store progress for each syllabus separately
+            "progress": _read_legacy_file(LEGACY_PROGRESS_FILE, {"syllabi_progress": {}}),
+        }
+        _STATE_CACHE["hash"] = None
+        _STATE_CACHE["dirty"] = True
+    # Initialize global settings if not present
+    if "global_settings" not in data["progress"]:
+        data["progress"]["global_settings"] = _default_global_settings()
+    _decode_progress(data["progress"])
+    # Chats that get the daily reminder, kept as a set in memory
+    data["subscribed_chats"] = set(data.get("subscribed_chats", ()))
+    _STATE_CACHE["data"] = data
+    _STATE_CACHE["mtime"] = mtime
+    _cache_syllabi(data["syllabi"])
+    return data
+
+def _cached_state():
+    """The in-memory state; post_init loads it, so saves never touch the disk from the event loop"""
+    return _STATE_CACHE["data"]
+
+def _mark_state_dirty():
+    """Flag the cached state so the next periodic flush writes it"""
+    _STATE_CACHE["dirty"] = True
+
+# Syllabi 📚
+def save_syllabi(data):
+    """Record the new syllabi in memory; the periodic flush writes them to disk"""
+    _cached_state()["syllabi"] = data
+    _cache_syllabi(data)
+    _mark_state_dirty()
+
+# Progress tracking 📊
 def save_progress(data):
-    with open('progress.json', 'w') as f:
-        json.dump(data, f, indent=4)
+    """Record the new progress in memory; the periodic flush writes it to disk"""
+    _cached_state()["progress"] = data
+    _mark_state_dirty()
+
+# Reminder subscriptions 🔔
+def subscribe_chat(chat_id):
+    """Include a chat in the daily reminder sweep"""
+    chats = _cached_state()["subscribed_chats"]
+    if chat_id not in chats:
+        chats.add(chat_id)
+        _mark_state_dirty()
+
+def unsubscribe_chat(chat_id):
+    """Drop a chat from the daily reminder sweep"""
+    chats = _cached_state()["subscribed_chats"]
+    if chat_id in chats:
+        chats.discard(chat_id)
+        _mark_state_dirty()
+
+# Writes are handed to one background thread so flushing never waits on the disk
+_write_queue = queue.Queue()
+
+def _writer_loop():
+    """Background thread: write queued (path, payload) pairs until a None sentinel arrives"""
+    while True:
+        item = _write_queue.get()
+        try:
+            if item is None:
+                return
+            path, payload = item
+            _write_atomic(path, payload)
+            _STATE_CACHE["mtime"] = _file_mtime(path)
+        except Exception as e:
+            logger.error(f"Error writing {path}: {str(e)}")
+            # Make the next flush retry the write
+            _STATE_CACHE["hash"] = None
+            _STATE_CACHE["dirty"] = True
+        finally:
+            _write_queue.task_done()
+
+_writer_thread = threading.Thread(target=_writer_loop, name="state-writer", daemon=True)
+_writer_thread.start()
+
+def stop_writer():
+    """Finish any queued writes and stop the writer thread"""
+    if _writer_thread.is_alive():
+        _write_queue.put(None)
+        _writer_thread.join()
+
+atexit.register(stop_writer)
+
+def flush_pending_writes():
+    """Queue the cached state for writing if it has unsaved changes"""
+    if not _STATE_CACHE["dirty"]:
+        return
+    _STATE_CACHE["dirty"] = False
+    # Serialize here so handlers can't mutate the dict while the thread is writing it
+    payload = _encode_state(_STATE_CACHE["data"])
+    payload_hash = hash(payload)
+    if payload_hash == _STATE_CACHE["hash"]:
+        return
+    _STATE_CACHE["hash"] = payload_hash
+    _write_queue.put((STATE_FILE, payload))
+
+async def flush_state_job(context):
+    """Periodic job: queue a write of the state file if anything changed since the last run"""
+    try:
+        flush_pending_writes()
+    except Exception as e:
+        logger.error(f"Error serializing {STATE_FILE}: {str(e)}")
+
+async def _flush_loop():
+    """Fallback for flush_state_job when the job queue isn't installed"""
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL)
+        await flush_state_job(None)
+
+# Async wrappers so file access runs in a worker thread instead of blocking the event loop
+async def aload_state():
+    # Unsaved changes mean the cache is authoritative, so skip the thread hop entirely
+    if _STATE_CACHE["dirty"]:
+        return _STATE_CACHE["data"]
+    return await asyncio.to_thread(load_state)
+
+async def aload_syllabi():
+    return (await aload_state())["syllabi"]
+
+async def aload_progress():
+    return (await aload_state())["progress"]
+
+# Updates are handled concurrently; this keeps progress transactions from interleaving
+_progress_lock = asyncio.Lock()
+
+@contextlib.asynccontextmanager
+async def progress_transaction():
+    """Load progress for a multi-step update and save it once when the block exits"""
+    async with _progress_lock:
+        progress = await aload_progress()
+        try:
+            yield progress
+        finally:
+            save_progress(progress)
+
+@functools.lru_cache(maxsize=32)
+def _build_syllabi_keyboard(prefix, version):
+    """Build the syllabus picker for a callback prefix; keyed on the cache version so any change rebuilds it"""
+    labels = _SYLLABI_CACHE["labels"]
+    tag = _SYLLABI_CACHE["fields_tag"]
+    keyboard = [
+        [InlineKeyboardButton(label, callback_data=f"{prefix}{tag}_{i}")]
+        for i, label in enumerate(labels.values())
+    ]
+    return InlineKeyboardMarkup(keyboard)
+
+def _field_from_callback(data, prefix):
+    """Map a syllabus button's callback_data back to the field name, or None if it's stale"""
+    tag, _, index = data.removeprefix(prefix).partition("_")
+    fields = _SYLLABI_CACHE["fields"]
+    if tag == _SYLLABI_CACHE["fields_tag"] and index.isdigit() and int(index) < len(fields):
+        return fields[int(index)]
+    return None
+
+def _completed_on(completed_at):
+    """Completion date suffix for /completed, empty if the date wasn't recorded"""
+    if not completed_at:
+        return ""
+    return f" (completed on {completed_at.strftime('%Y-%m-%d')})"
+
+SECONDS_PER_DAY = 86400
+
+def set_due_date(syllabus_progress, due_date):
+    """Store the due date for display, and as in-memory epoch seconds for quick day math"""
+    syllabus_progress["due_date"] = due_date
+    syllabus_progress["due_ts"] = int(due_date.timestamp())
+
+def days_until_due(syllabus_progress):
+    """Whole days until the current task is due, negative once it's overdue"""
+    return (syllabus_progress["due_ts"] - int(unix_time())) // SECONDS_PER_DAY
+
+def new_syllabus_progress(progress):
+    """Fresh progress record for a syllabus starting at the first task"""
+    now = datetime.now()
+    syllabus_progress = {
+        "current_week": 1,
+        "completed_weeks": set(),
+        "completion_dates": {},
+        "start_date": now
+    }
+    set_due_date(syllabus_progress, now + timedelta(days=progress["global_settings"].get("reminder_interval", 7)))
+    return syllabus_progress
 
 # Update or get progress for a specific syllabus
 def get_syllabus_progress(progress, syllabus_name):
@@ -69,12 +376,7 @@ def get_syllabus_progress(progress, syllabus_name):
         progress["syllabi_progress"] = {}
         
     if syllabus_name not in progress["syllabi_progress"]:
-        progress["syllabi_progress"][syllabus_name] = {
-            "current_week": 1,
-            "completed_weeks": [],
-            "start_date": datetime.now().isoformat(),
-            "due_date": (datetime.now() + timedelta(days=progress["global_settings"].get("reminder_interval", 7))).isoformat()
-        }
+        progress["syllabi_progress"][syllabus_name] = new_syllabus_progress(progress)
     
     return progress["syllabi_progress"][syllabus_name]
 
@@ -83,99 +385,91 @@ def update_due_date(progress, syllabus_name):
     """Update the due date for the current task"""
     syllabus_progress = get_syllabus_progress(progress, syllabus_name)
     interval = progress["global_settings"].get("reminder_interval", 7)
-    syllabus_progress["due_date"] = (datetime.now() + timedelta(days=interval)).isoformat()
+    set_due_date(syllabus_progress, datetime.now() + timedelta(days=interval))
     return progress
 
-# Error handler decorator for commands
-def handle_errors(func):
-    async def wrapper(update, context, *args, **kwargs):
-        try:
-            return await func(update, context, *args, **kwargs)
-        except FileNotFoundError as e:
-            logger.error(f"File not found error: {str(e)}")
-            await update.message.reply_text(
-                "⚠️ Data file not found. This might be your first time using the bot. "
-                "Try using /start to initialize your progress tracking!"
-            )
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error: {str(e)}")
-            await update.message.reply_text(
-                "⚠️ There was an error reading the data file. "
-                "The format might be corrupted. Contact the administrator for help."
-            )
-        except IndexError as e:
-            logger.error(f"Index error: {str(e)}")
-            await update.message.reply_text(
-                "⚠️ Task index out of range. Make sure you have selected a syllabus with /start."
-            )
-        except Exception as e:
-            logger.error(f"Unexpected error: {str(e)}\n{traceback.format_exc()}")
-            await update.message.reply_text(
-                "⚠️ An unexpected error occurred. Please try again later or contact the administrator."
-            )
-    return wrapper
+# Friendly replies for the errors handlers commonly hit, checked in order by error_handler
+ERROR_REPLIES = (
+    (FileNotFoundError, "File not found error",
+     "⚠️ Data file not found. This might be your first time using the bot. "
+     "Try using /start to initialize your progress tracking!"),
+    (json.JSONDecodeError, "JSON decode error",
+     "⚠️ There was an error reading the data file. "
+     "The format might be corrupted. Contact the administrator for help."),
+    (IndexError, "Index error",
+     "⚠️ Task index out of range. Make sure you have selected a syllabus with /start."),
+)
+
+NO_ACTIVE_MSG = "No active syllabus or it's paused. Use /start or /resume_syllabus. 🚧"
+
+def _active_field(syllabi):
+    """Return the current syllabus name, or None if none is selected or it's paused"""
+    field = syllabi["current_field"]
+    if not field:
+        return None
+    syllabus = syllabi["syllabi"].get(field)
+    return None if not syllabus or syllabus.get("paused", False) else field
 
 # Bot handlers 🎮
-@handle_errors
 async def start(update: Update, context):
     """Handler for the /start command with syllabus selection. 🌟"""
-    syllabi = load_syllabi()
+    syllabi = await aload_syllabi()
+    subscribe_chat(update.effective_chat.id)
     if not syllabi["syllabi"]:
-        await update.message.reply_text("No syllabi available. Please add some manually to syllabi.json. 🚧")
+        await update.message.reply_text("No syllabi available. Please add some manually to state.json. 🚧")
         return
-    keyboard = [
-        [InlineKeyboardButton(f"{field} {'(Paused ⏸️)' if syllabi['syllabi'][field].get('paused', False) else '(Active ▶️)'}", callback_data=f"start_{field}")]
-        for field in syllabi["syllabi"]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = _build_syllabi_keyboard("start_", _SYLLABI_CACHE["version"])
     await update.message.reply_text("Select a syllabus to start or resume: 📚🎉", reply_markup=reply_markup)
 
-@handle_errors
 async def start_syllabus_callback(update: Update, context):
     """Handle syllabus selection from /start. 🔄"""
     query = update.callback_query
-    await query.answer()
-    field_name = query.data.replace("start_", "")
-    syllabi = load_syllabi()
-    progress = load_progress()
-    
-    if field_name in syllabi["syllabi"] and not syllabi["syllabi"][field_name].get("paused", False):
-        syllabi["current_field"] = field_name
-        save_syllabi(syllabi)
-        
-        # Get or initialize progress for this syllabus
-        syllabus_progress = get_syllabus_progress(progress, field_name)
-        current_week = syllabus_progress["current_week"]
-        
-        # Update due date for new task if starting fresh
-        if current_week == 1 and not syllabus_progress["completed_weeks"]:
-            update_due_date(progress, field_name)
-            save_progress(progress)
+    _, syllabi = await asyncio.gather(query.answer(), aload_syllabi())
+    field_name = _field_from_callback(query.data, "start_")
+    if field_name is None:
+        await query.edit_message_text("Syllabus not found. 🚧")
+        return
+    # Hold the progress lock from load to save; the reply is sent after releasing it
+    async with _progress_lock:
+        progress = await aload_progress()
         
-        task_index = current_week - 1
-        if task_index >= len(syllabi["syllabi"][field_name]["tasks"]):
-            # Reset if we're beyond the end (shouldn't happen normally)
-            task_index = 0
-            syllabus_progress["current_week"] = 1
-            save_progress(progress)
+        if field_name in syllabi["syllabi"] and not syllabi["syllabi"][field_name].get("paused", False):
+            syllabi["current_field"] = field_name
+            save_syllabi(syllabi)
+            tasks = _SYLLABI_CACHE["tasks"][field_name]
             
-        days_remaining = "Unknown"
-        if "due_date" in syllabus_progress:
-            due_date = datetime.fromisoformat(syllabus_progress["due_date"])
-            days_remaining = (due_date - datetime.now()).days
+            # Get or initialize progress for this syllabus
+            syllabus_progress = get_syllabus_progress(progress, field_name)
+            current_week = syllabus_progress["current_week"]
             
-        status_text = "Starting with" if current_week == 1 and not syllabus_progress["completed_weeks"] else "Continuing with"
-        
-        await query.edit_message_text(
-            f"Switched to '{field_name}' syllabus! 🌱\n\n"
-            f"{status_text}:\n\n"
-            f"{syllabi['syllabi'][field_name]['tasks'][task_index]}\n\n"
-            f"Due in {days_remaining} days. Use /check when completed! 🚀"
-        )
-    else:
-        await query.edit_message_text(f"'{field_name}' is paused. Resume with /resume_syllabus. 🚧")
+            # Update due date for new task if starting fresh
+            if current_week == 1 and not syllabus_progress["completed_weeks"]:
+                update_due_date(progress, field_name)
+                save_progress(progress)
+            
+            task_index = current_week - 1
+            if task_index >= len(tasks):
+                # Reset if we're beyond the end (shouldn't happen normally)
+                task_index = 0
+                syllabus_progress["current_week"] = 1
+                save_progress(progress)
+                
+            days_remaining = "Unknown"
+            if "due_date" in syllabus_progress:
+                days_remaining = days_until_due(syllabus_progress)
+                
+            status_text = "Starting with" if current_week == 1 and not syllabus_progress["completed_weeks"] else "Continuing with"
+            
+            reply = (
+                f"Switched to '{field_name}' syllabus! 🌱\n\n"
+                f"{status_text}:\n\n"
+                f"{tasks[task_index]}\n\n"
+                f"Due in {days_remaining} days. Use /check when completed! 🚀"
+            )
+        else:
+            reply = f"'{field_name}' is paused. Resume with /resume_syllabus. 🚧"
+    await query.edit_message_text(reply)
 
-@handle_errors
 async def help_command(update: Update, context):
     """Handler for the /help command. ℹ️"""
     await update.message.reply_text(
@@ -201,31 +495,29 @@ async def help_command(update: Update, context):
         "Reminder Settings:\n"
         "- /toggle_reminders - Turn reminders on/off 🔔\n\n"
         
-        "Note: Edit syllabi manually in syllabi.json. 📝"
+        "Note: Edit syllabi manually in the \"syllabi\" section of state.json. 📝"
     )
 
-@handle_errors
 async def current_week(update: Update, context):
     """Show the current week's task. ⏳"""
-    syllabi = load_syllabi()
-    progress = load_progress()
-    if not syllabi["current_field"] or syllabi["syllabi"][syllabi["current_field"]].get("paused", False):
-        await update.message.reply_text("No active syllabus or it's paused. Use /start or /resume_syllabus. 🚧")
+    syllabi = await aload_syllabi()
+    progress = await aload_progress()
+    current_field = _active_field(syllabi)
+    if not current_field:
+        await update.message.reply_text(NO_ACTIVE_MSG)
         return
     
-    current_field = syllabi["current_field"]
     syllabus_progress = get_syllabus_progress(progress, current_field)
     current_week = syllabus_progress["current_week"]
     
     try:
-        if 0 < current_week <= len(syllabi['syllabi'][current_field]["tasks"]):
+        if 0 < current_week <= _SYLLABI_CACHE["task_counts"][current_field]:
             # Calculate days remaining
             days_remaining = "Unknown"
             status = ""
             
             if "due_date" in syllabus_progress:
-                due_date = datetime.fromisoformat(syllabus_progress["due_date"])
-                days = (due_date - datetime.now()).days
+                days = days_until_due(syllabus_progress)
                 
                 if days < 0:
                     days_remaining = abs(days)
@@ -236,7 +528,7 @@ async def current_week(update: Update, context):
             
             await update.message.reply_text(
                 f"Current task ({current_field}): 🌟\n\n"
-                f"{syllabi['syllabi'][current_field]['tasks'][current_week-1]}\n\n"
+                f"{_SYLLABI_CACHE['tasks'][current_field][current_week-1]}\n\n"
                 f"{status}"
             )
         else:
@@ -244,58 +536,51 @@ async def current_week(update: Update, context):
     except Exception as e:
         await update.message.reply_text(f"Error: {str(e)}. Please try again or use /start. 🚧")
 
-@handle_errors
 async def show_completed(update: Update, context):
     """Show completed weeks. ✅"""
-    syllabi = load_syllabi()
-    progress = load_progress()
-    if not syllabi["current_field"] or syllabi["syllabi"][syllabi["current_field"]].get("paused", False):
-        await update.message.reply_text("No active syllabus or it's paused. Use /start or /resume_syllabus. 🚧")
+    syllabi = await aload_syllabi()
+    progress = await aload_progress()
+    current_field = _active_field(syllabi)
+    if not current_field:
+        await update.message.reply_text(NO_ACTIVE_MSG)
         return
     
-    current_field = syllabi["current_field"]
     syllabus_progress = get_syllabus_progress(progress, current_field)
     
     try:
-        completed = []
-        for i in syllabus_progress["completed_weeks"]:
-            if i < len(syllabi['syllabi'][current_field]['tasks']):
-                task = syllabi['syllabi'][current_field]['tasks'][i]
-                
-                # Add completion date if available
-                date_info = ""
-                if "completion_dates" in syllabus_progress and str(i) in syllabus_progress["completion_dates"]:
-                    completion_date = datetime.fromisoformat(syllabus_progress["completion_dates"][str(i)])
-                    date_info = f" (completed on {completion_date.strftime('%Y-%m-%d')})"
-                
-                completed.append(f"✅ {task}{date_info}")
+        tasks = _SYLLABI_CACHE["tasks"][current_field]
+        completion_dates = syllabus_progress["completion_dates"]
+        completed = "\n".join(
+            f"✅ {tasks[i]}{_completed_on(completion_dates.get(i))}"
+            for i in sorted(syllabus_progress["completed_weeks"])
+            if i < len(tasks)
+        )
         
         if completed:
             await update.message.reply_text(
                 f"Completed tasks ({current_field}): 🎉\n\n"
-                f"{chr(10).join(completed)}\n"
+                f"{completed}\n"
             )
         else:
             await update.message.reply_text("No tasks completed yet. 🚧 Keep going!")
     except Exception as e:
         await update.message.reply_text(f"Error: {str(e)}. Please try again or use /start. 🚧")
 
-@handle_errors
 async def check_progress(update: Update, context):
     """Manually check if the current week's tasks are done. 🔍"""
-    syllabi = load_syllabi()
-    progress = load_progress()
+    syllabi = await aload_syllabi()
+    progress = await aload_progress()
     
-    if not syllabi["current_field"] or syllabi["syllabi"][syllabi["current_field"]].get("paused", False):
-        await update.message.reply_text("No active syllabus or it's paused. Use /start or /resume_syllabus. 🚧")
+    current_field = _active_field(syllabi)
+    if not current_field:
+        await update.message.reply_text(NO_ACTIVE_MSG)
         return
         
     try:
-        current_field = syllabi["current_field"]
         syllabus_progress = get_syllabus_progress(progress, current_field)
         current_week = syllabus_progress["current_week"]
         
-        if current_week > 0 and current_week <= len(syllabi['syllabi'][current_field]["tasks"]):
+        if current_week > 0 and current_week <= _SYLLABI_CACHE["task_counts"][current_field]:
             # Create proper InlineKeyboardMarkup with buttons
             keyboard = [
                 [
@@ -308,8 +593,7 @@ async def check_progress(update: Update, context):
             # Show due date if available
             due_info = ""
             if "due_date" in syllabus_progress:
-                due_date = datetime.fromisoformat(syllabus_progress["due_date"])
-                days = (due_date - datetime.now()).days
+                days = days_until_due(syllabus_progress)
                 
                 if days < 0:
                     due_info = f"\n\n⚠️ This task is overdue by {abs(days)} days!"
@@ -318,7 +602,7 @@ async def check_progress(update: Update, context):
             
             await update.message.reply_text(
                 f"Have you completed this task from {current_field}:\n\n"
-                f"{syllabi['syllabi'][current_field]['tasks'][current_week-1]}{due_info}\n\n"
+                f"{_SYLLABI_CACHE['tasks'][current_field][current_week-1]}{due_info}\n\n"
                 f"Click a button: ⬇️",
                 reply_markup=reply_markup
             )
@@ -327,12 +611,12 @@ async def check_progress(update: Update, context):
     except Exception as e:
         await update.message.reply_text(f"Error: {str(e)}. Please try again or use /start. 🚧")
 
-@handle_errors
 async def reset_progress(update: Update, context):
     """Reset progress to start from the beginning. 🔄"""
-    syllabi = load_syllabi()
-    if not syllabi["current_field"] or syllabi["syllabi"][syllabi["current_field"]].get("paused", False):
-        await update.message.reply_text("No active syllabus or it's paused. Use /start or /resume_syllabus. 🚧")
+    syllabi = await aload_syllabi()
+    current_field = _active_field(syllabi)
+    if not current_field:
+        await update.message.reply_text(NO_ACTIVE_MSG)
         return
     
     # Create proper InlineKeyboardMarkup with buttons
@@ -350,32 +634,26 @@ async def reset_progress(update: Update, context):
         reply_markup=reply_markup
     )
 
-@handle_errors
 async def show_all_syllabi(update: Update, context):
     """Show all available syllabi. 🔍"""
-    syllabi = load_syllabi()
+    syllabi = await aload_syllabi()
     if syllabi["syllabi"]:
-        keyboard = [
-            [InlineKeyboardButton(f"{field} {'(Paused ⏸️)' if syllabi['syllabi'][field].get('paused', False) else '(Active ▶️)'}", callback_data=f"show_{field}")]
-            for field in syllabi["syllabi"]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = _build_syllabi_keyboard("show_", _SYLLABI_CACHE["version"])
         await update.message.reply_text("Select a syllabus to view details: 📚", reply_markup=reply_markup)
     else:
-        await update.message.reply_text("No syllabi available. Please add some manually to syllabi.json. 🚧")
+        await update.message.reply_text("No syllabi available. Please add some manually to state.json. 🚧")
 
-@handle_errors
 async def show_syllabus_callback(update: Update, context):
     """Handle syllabus selection from /show_all_syllabi. 🔍"""
     query = update.callback_query
-    await query.answer()
-    field_name = query.data.replace("show_", "")
-    syllabi = load_syllabi()
-    progress = load_progress()
+    # Answer the callback while the state loads
+    _, state = await asyncio.gather(query.answer(), aload_state())
+    syllabi, progress = state["syllabi"], state["progress"]
+    field_name = _field_from_callback(query.data, "show_")
     
     if field_name in syllabi["syllabi"]:
         try:
-            tasks = "\n".join([f"{i+1}. {task}" for i, task in enumerate(syllabi['syllabi'][field_name]["tasks"])])
+            tasks = _SYLLABI_CACHE["rendered_tasks"][field_name]
             status = "(Paused ⏸️)" if syllabi["syllabi"][field_name].get("paused", False) else "(Active ▶️)"
             
             # Get progress info if available
@@ -383,7 +661,7 @@ async def show_syllabus_callback(update: Update, context):
             if "syllabi_progress" in progress and field_name in progress["syllabi_progress"]:
                 syllabus_progress = progress["syllabi_progress"][field_name]
                 completed = len(syllabus_progress["completed_weeks"])
-                total = len(syllabi['syllabi'][field_name]["tasks"])
+                total = _SYLLABI_CACHE["task_counts"][field_name]
                 current = syllabus_progress["current_week"]
                 
                 # Prevent showing current week beyond total tasks
@@ -394,91 +672,82 @@ async def show_syllabus_callback(update: Update, context):
             
             await query.edit_message_text(
                 f"Syllabus: {field_name} {status}\n"
-                f"Total weeks: {len(syllabi['syllabi'][field_name]['tasks'])}{progress_info}\n\n"
+                f"Total weeks: {_SYLLABI_CACHE['task_counts'][field_name]}{progress_info}\n\n"
                 f"Tasks:\n{tasks}\n\n"
                 f"Use /start to select or /switch_syllabus to switch! 🚀"
             )
         except Exception as e:
             await query.edit_message_text(f"Error displaying syllabus: {str(e)}. Please try again. 🚧")
 
-@handle_errors
 async def switch_syllabus(update: Update, context):
     """Switch to another syllabus with interactive selection. 🔄"""
-    syllabi = load_syllabi()
+    syllabi = await aload_syllabi()
     if not syllabi["syllabi"]:
-        await update.message.reply_text("No syllabi to switch. Please add some manually to syllabi.json. 🚧")
+        await update.message.reply_text("No syllabi to switch. Please add some manually to state.json. 🚧")
         return
-    keyboard = [
-        [InlineKeyboardButton(f"{field} {'(Paused ⏸️)' if syllabi['syllabi'][field].get('paused', False) else '(Active ▶️)'}", callback_data=f"switch_{field}")]
-        for field in syllabi["syllabi"]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = _build_syllabi_keyboard("switch_", _SYLLABI_CACHE["version"])
     await update.message.reply_text("Select a syllabus to switch to: 🔄", reply_markup=reply_markup)
 
-@handle_errors
 async def switch_syllabus_callback(update: Update, context):
     """Handle syllabus switch while preserving progress. 🔄"""
     query = update.callback_query
-    await query.answer()
-    
-    field_name = query.data.replace("switch_", "")
-    syllabi = load_syllabi()
-    progress = load_progress()
-    
-    if field_name in syllabi["syllabi"] and not syllabi["syllabi"][field_name].get("paused", False):
-        # Save current field to syllabi.json
-        syllabi["current_field"] = field_name
-        save_syllabi(syllabi)
-        
-        # Get or initialize progress for this syllabus
-        syllabus_progress = get_syllabus_progress(progress, field_name)
-        current_week = syllabus_progress["current_week"]
-        
-        # Update due date for this syllabus
-        update_due_date(progress, field_name)
-        save_progress(progress)
-        
-        # Determine if this is a new syllabus or one we're continuing
-        status_text = "Starting with" if current_week == 1 and not syllabus_progress["completed_weeks"] else "Continuing with"
-        task_index = current_week - 1
+    _, syllabi = await asyncio.gather(query.answer(), aload_syllabi())
+    field_name = _field_from_callback(query.data, "switch_")
+    if field_name is None:
+        await query.edit_message_text("Syllabus not found. 🚧")
+        return
+    # Hold the progress lock from load to save; the reply is sent after releasing it
+    async with _progress_lock:
+        progress = await aload_progress()
         
-        # Make sure the task index is valid
-        if task_index >= len(syllabi["syllabi"][field_name]["tasks"]):
-            task_index = 0
-            syllabus_progress["current_week"] = 1
+        if field_name in syllabi["syllabi"] and not syllabi["syllabi"][field_name].get("paused", False):
+            # Save current field
+            syllabi["current_field"] = field_name
+            save_syllabi(syllabi)
+            
+            # Get or initialize progress for this syllabus
+            syllabus_progress = get_syllabus_progress(progress, field_name)
+            current_week = syllabus_progress["current_week"]
+            
+            # Update due date for this syllabus
+            update_due_date(progress, field_name)
             save_progress(progress)
-        
-        # Send confirmation message
-        await query.edit_message_text(
-            f"Switched to '{field_name}' syllabus! 🌱\n\n"
-            f"{status_text}:\n\n"
-            f"{syllabi['syllabi'][field_name]['tasks'][task_index]}\n\n"
-            f"Due in {progress['global_settings'].get('reminder_interval', 7)} days. Use /check when completed. 🚀"
-        )
-    else:
-        await query.edit_message_text(f"'{field_name}' is paused. Resume with /resume_syllabus. 🚧")
+            
+            # Determine if this is a new syllabus or one we're continuing
+            status_text = "Starting with" if current_week == 1 and not syllabus_progress["completed_weeks"] else "Continuing with"
+            task_index = current_week - 1
+            
+            # Make sure the task index is valid
+            if task_index >= _SYLLABI_CACHE["task_counts"][field_name]:
+                task_index = 0
+                syllabus_progress["current_week"] = 1
+                save_progress(progress)
+            
+            # Confirmation message
+            reply = (
+                f"Switched to '{field_name}' syllabus! 🌱\n\n"
+                f"{status_text}:\n\n"
+                f"{_SYLLABI_CACHE['tasks'][field_name][task_index]}\n\n"
+                f"Due in {progress['global_settings'].get('reminder_interval', 7)} days. Use /check when completed. 🚀"
+            )
+        else:
+            reply = f"'{field_name}' is paused. Resume with /resume_syllabus. 🚧"
+    await query.edit_message_text(reply)
 
-@handle_errors
 async def pause_syllabus(update: Update, context):
     """Pause tracking for a syllabus. ⏸️"""
-    syllabi = load_syllabi()
+    syllabi = await aload_syllabi()
     if not syllabi["syllabi"]:
-        await update.message.reply_text("No syllabi to pause. Please add some manually to syllabi.json. 🚧")
+        await update.message.reply_text("No syllabi to pause. Please add some manually to state.json. 🚧")
         return
-    keyboard = [
-        [InlineKeyboardButton(f"{field} {'(Paused ⏸️)' if syllabi['syllabi'][field].get('paused', False) else '(Active ▶️)'}", callback_data=f"pause_{field}")]
-        for field in syllabi["syllabi"]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = _build_syllabi_keyboard("pause_", _SYLLABI_CACHE["version"])
     await update.message.reply_text("Select a syllabus to pause: ⏸️", reply_markup=reply_markup)
 
-@handle_errors
 async def pause_syllabus_callback(update: Update, context):
     """Handle pausing a syllabus. ⏸️"""
     query = update.callback_query
-    await query.answer()
-    field_name = query.data.replace("pause_", "")
-    syllabi = load_syllabi()
+    _, syllabi = await asyncio.gather(query.answer(), aload_syllabi())
+    field_name = _field_from_callback(query.data, "pause_")
     if field_name in syllabi["syllabi"]:
         try:
             syllabi["syllabi"][field_name]["paused"] = True
@@ -491,27 +760,20 @@ async def pause_syllabus_callback(update: Update, context):
     else:
         await query.edit_message_text("Syllabus not found. 🚧")
 
-@handle_errors
 async def resume_syllabus(update: Update, context):
     """Resume tracking for a syllabus. ▶️"""
-    syllabi = load_syllabi()
+    syllabi = await aload_syllabi()
     if not syllabi["syllabi"]:
-        await update.message.reply_text("No syllabi to resume. Please add some manually to syllabi.json. 🚧")
+        await update.message.reply_text("No syllabi to resume. Please add some manually to state.json. 🚧")
         return
-    keyboard = [
-        [InlineKeyboardButton(f"{field} {'(Paused ⏸️)' if syllabi['syllabi'][field].get('paused', False) else '(Active ▶️)'}", callback_data=f"resume_{field}")]
-        for field in syllabi["syllabi"]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = _build_syllabi_keyboard("resume_", _SYLLABI_CACHE["version"])
     await update.message.reply_text("Select a syllabus to resume: ▶️", reply_markup=reply_markup)
 
-@handle_errors
 async def resume_syllabus_callback(update: Update, context):
     """Handle resuming a syllabus. ▶️"""
     query = update.callback_query
-    await query.answer()
-    field_name = query.data.replace("resume_", "")
-    syllabi = load_syllabi()
+    _, syllabi = await asyncio.gather(query.answer(), aload_syllabi())
+    field_name = _field_from_callback(query.data, "resume_")
     if field_name in syllabi["syllabi"]:
         try:
             syllabi["syllabi"][field_name]["paused"] = False
@@ -522,21 +784,20 @@ async def resume_syllabus_callback(update: Update, context):
     else:
         await query.edit_message_text("Syllabus not found. 🚧")
 
-@handle_errors
 async def toggle_reminders(update: Update, context):
     """Toggle reminders on or off"""
-    progress = load_progress()
+    progress = await aload_progress()
     
     # Toggle setting
-    current_status = progress["global_settings"].get("reminders_enabled", True)
-    progress["global_settings"]["reminders_enabled"] = not current_status
+    settings = progress["global_settings"]
+    enabled = not settings.get("reminders_enabled", True)
+    settings["reminders_enabled"] = enabled
     save_progress(progress)
     
     # Inform user
-    new_status = "enabled ✅" if progress["global_settings"]["reminders_enabled"] else "disabled ⏸️"
+    new_status = "enabled ✅" if enabled else "disabled ⏸️"
     await update.message.reply_text(f"Reminders are now {new_status}")
 
-@handle_errors
 async def set_reminder_interval(update: Update, context):
     """Set the number of days for each task"""
     if not context.args:
@@ -552,24 +813,36 @@ async def set_reminder_interval(update: Update, context):
             await update.message.reply_text("Please use a positive number of days.")
             return
             
-        progress = load_progress()
-        progress["global_settings"]["reminder_interval"] = days
-        
-        # Update due date for current syllabus if one is active
-        syllabi = load_syllabi()
-        if syllabi["current_field"]:
-            update_due_date(progress, syllabi["current_field"])
-        
-        save_progress(progress)
+        # Load both sections up front and hold the progress lock until the change is saved
+        async with _progress_lock:
+            state = await aload_state()
+            progress, syllabi = state["progress"], state["syllabi"]
+            progress["global_settings"]["reminder_interval"] = days
+            
+            # Update due date for current syllabus if one is active
+            if syllabi["current_field"]:
+                update_due_date(progress, syllabi["current_field"])
+            
+            save_progress(progress)
         await update.message.reply_text(f"Task interval set to {days} days! ⏱️")
     except ValueError:
         await update.message.reply_text("Please enter a valid number.")
 
-@handle_errors
+@functools.lru_cache(maxsize=32)
+def _stats_summary(field, completed_tasks, total_tasks, current_week):
+    """The /statistics lines that only change when a task is completed or the syllabus is reset"""
+    # Calculate completion percentage
+    completion_pct = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
+    return (
+        f"📊 Statistics for {field}\n\n"
+        f"✅ Tasks completed: {completed_tasks}/{total_tasks} ({completion_pct:.1f}%)\n"
+        f"📈 Current progress: Task {min(current_week, total_tasks)}/{total_tasks}\n"
+    )
+
 async def show_statistics(update: Update, context):
     """Show simple statistics about the current syllabus progress"""
-    syllabi = load_syllabi()
-    progress = load_progress()
+    syllabi = await aload_syllabi()
+    progress = await aload_progress()
     
     if not syllabi["current_field"]:
         await update.message.reply_text("No active syllabus. Use /start to select one.")
@@ -584,28 +857,23 @@ async def show_statistics(update: Update, context):
     syllabus_progress = get_syllabus_progress(progress, current_field)
     
     # Gather statistics
-    total_tasks = len(syllabi["syllabi"][current_field]["tasks"])
+    total_tasks = _SYLLABI_CACHE["task_counts"][current_field]
+    now = datetime.now()
     completed_tasks = len(syllabus_progress["completed_weeks"])
     current_week = syllabus_progress["current_week"]
     
-    # Calculate completion percentage
-    completion_pct = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0
-    
     # Calculate days since started
-    start_date = datetime.fromisoformat(syllabus_progress["start_date"]) if isinstance(syllabus_progress["start_date"], str) else syllabus_progress["start_date"]
-    days_active = (datetime.now() - start_date).days
+    start_date = syllabus_progress["start_date"]
+    days_active = (now - start_date).days
     
     # Calculate days left for current task
     days_left = "N/A"
     if "due_date" in syllabus_progress:
-        due_date = datetime.fromisoformat(syllabus_progress["due_date"]) if isinstance(syllabus_progress["due_date"], str) else syllabus_progress["due_date"]
-        days_left = (due_date - datetime.now()).days
+        days_left = days_until_due(syllabus_progress)
         
     # Format the statistics message
     stats_message = (
-        f"📊 Statistics for {current_field}\n\n"
-        f"✅ Tasks completed: {completed_tasks}/{total_tasks} ({completion_pct:.1f}%)\n"
-        f"📈 Current progress: Task {min(current_week, total_tasks)}/{total_tasks}\n"
+        _stats_summary(current_field, completed_tasks, total_tasks, current_week) +
         f"📆 Days since started: {days_active}\n"
     )
     
@@ -624,7 +892,7 @@ async def show_statistics(update: Update, context):
             try:
                 avg_days_per_task = days_active / completed_tasks if completed_tasks > 0 else progress["global_settings"].get("reminder_interval", 7)
                 estimated_days_left = remaining_tasks * avg_days_per_task
-                estimated_completion_date = datetime.now() + timedelta(days=estimated_days_left)
+                estimated_completion_date = now + timedelta(days=estimated_days_left)
                 stats_message += f"🗓️ Estimated completion: {estimated_completion_date.strftime('%Y-%m-%d')} (in {int(estimated_days_left)} days)\n"
             except Exception as e:
                 # Skip this part if there's an error
@@ -634,238 +902,286 @@ async def show_statistics(update: Update, context):
     # Send the statistics - without Markdown parsing to avoid errors
     await update.message.reply_text(stats_message)
 
+# Edits to the same message within this many seconds are merged into one API call
+EDIT_COALESCE_WINDOW = 0.15
+# Latest (query, text) waiting to be sent for each (chat_id, message_id)
+_pending_edits = {}
+# Holds references to running edit tasks until they finish
+_edit_tasks = set()
+
+def _schedule_edit(query, text):
+    """Edit the callback's message shortly, sending only the newest text if more edits follow"""
+    key = (query.message.chat_id, query.message.message_id)
+    first = key not in _pending_edits
+    _pending_edits[key] = (query, text)
+    if first:
+        task = asyncio.create_task(_send_pending_edit(key))
+        _edit_tasks.add(task)
+        task.add_done_callback(_edit_tasks.discard)
+
+async def _send_pending_edit(key):
+    await asyncio.sleep(EDIT_COALESCE_WINDOW)
+    sent = None
+    try:
+        # Stay in _pending_edits until the edit is done; resend if newer text arrived meanwhile
+        while _pending_edits[key] is not sent:
+            sent = _pending_edits[key]
+            query, text = sent
+            try:
+                await query.edit_message_text(text)
+            except Exception as e:
+                logger.error(f"Failed to edit message {key}: {e}")
+    finally:
+        _pending_edits.pop(key, None)
+
+def _edit_pending(query):
+    """True if the callback's message already has a reply queued, i.e. its buttons were used"""
+    return (query.message.chat_id, query.message.message_id) in _pending_edits
+
 # Button handling functions
 async def handle_yes_response(update: Update, context):
     """Handle when user completes a task"""
     query = update.callback_query
-    await query.answer()
-    
-    syllabi = load_syllabi()
-    progress = load_progress()
-    
-    if not syllabi["current_field"]:
-        await query.edit_message_text("No active syllabus. Use /start to select one.")
-        return
+    _, syllabi = await asyncio.gather(query.answer(), aload_syllabi())
+    async with progress_transaction() as progress:
+        # Another tap on this message already changed progress; only its reply should go out
+        if _edit_pending(query):
+            return
+        if not syllabi["current_field"]:
+            _schedule_edit(query, "No active syllabus. Use /start to select one.")
+            return
         
-    current_field = syllabi["current_field"]
-    syllabus_progress = get_syllabus_progress(progress, current_field)
+        current_field = syllabi["current_field"]
+        syllabus_progress = get_syllabus_progress(progress, current_field)
+        tasks = _SYLLABI_CACHE["tasks"][current_field]
+        n_tasks = len(tasks)
     
-    try:
-        # Get the current week index (0-based for array access)
-        current_week = syllabus_progress["current_week"]
-        current_week_index = current_week - 1
-        
-        # Add current week INDEX to completed weeks
-        if current_week_index not in syllabus_progress["completed_weeks"]:
-            syllabus_progress["completed_weeks"].append(current_week_index)
+        interval = progress["global_settings"].get("reminder_interval", 7)
+    
+        try:
+            # Get the current week index (0-based for array access)
+            current_week = syllabus_progress["current_week"]
+            current_week_index = current_week - 1
         
-        # Record completion date and time
-        now = datetime.now()
-        if "completion_dates" not in syllabus_progress:
-            syllabus_progress["completion_dates"] = {}
-        syllabus_progress["completion_dates"][str(current_week_index)] = now.isoformat()
+            # Add current week INDEX to completed weeks
+            syllabus_progress["completed_weeks"].add(current_week_index)
         
-        # Move to next week
-        syllabus_progress["current_week"] += 1
+            # Record completion date and time
+            now = datetime.now()
+            syllabus_progress["completion_dates"][current_week_index] = now
         
-        # Update due date for next task
-        update_due_date(progress, current_field)
+            # Move to next week
+            syllabus_progress["current_week"] += 1
         
-        # Save progress
-        save_progress(progress)
+            # Update due date for next task
+            set_due_date(syllabus_progress, now + timedelta(days=interval))
         
-        # Check if this was the final task
-        if syllabus_progress["current_week"] > len(syllabi['syllabi'][current_field]["tasks"]):
-            await query.edit_message_text(
-                f"🎉 Congratulations! You've completed the entire '{current_field}' syllabus! 🎓\n\n"
-                f"Use /show_all_syllabi to choose another syllabus to work on."
-            )
-        else:
-            # Get indices for completed task and next task
-            completed_task_index = current_week_index
-            next_task_index = syllabus_progress["current_week"] - 1
+            # Check if this was the final task
+            if syllabus_progress["current_week"] > n_tasks:
+                _schedule_edit(query,
+                    f"🎉 Congratulations! You've completed the entire '{current_field}' syllabus! 🎓\n\n"
+                    f"Use /show_all_syllabi to choose another syllabus to work on."
+                )
+            else:
+                # Get indices for completed task and next task
+                completed_task_index = current_week_index
+                next_task_index = syllabus_progress["current_week"] - 1
             
-            # Make sure indices are valid
-            if completed_task_index < 0 or completed_task_index >= len(syllabi['syllabi'][current_field]["tasks"]):
-                completed_task_index = 0
-            if next_task_index < 0 or next_task_index >= len(syllabi['syllabi'][current_field]["tasks"]):
-                next_task_index = 0
+                # Make sure indices are valid
+                if completed_task_index < 0 or completed_task_index >= n_tasks:
+                    completed_task_index = 0
+                if next_task_index < 0 or next_task_index >= n_tasks:
+                    next_task_index = 0
             
-            # Show completed task and next task with proper indices
-            await query.edit_message_text(
-                f"Great job! 🎉 You've completed:\n\n"
-                f"{syllabi['syllabi'][current_field]['tasks'][completed_task_index]}\n\n"
-                f"Now, move on to:\n\n"
-                f"{syllabi['syllabi'][current_field]['tasks'][next_task_index]}\n\n"
-                f"Due in {progress['global_settings'].get('reminder_interval', 7)} days. ⏳"
-            )
-    except Exception as e:
-        await query.edit_message_text(f"Error updating progress: {str(e)}. Please try again.")
+                # Show completed task and next task with proper indices
+                _schedule_edit(query,
+                    f"Great job! 🎉 You've completed:\n\n"
+                    f"{tasks[completed_task_index]}\n\n"
+                    f"Now, move on to:\n\n"
+                    f"{tasks[next_task_index]}\n\n"
+                    f"Due in {interval} days. ⏳"
+                )
+        except Exception as e:
+            _schedule_edit(query, f"Error updating progress: {str(e)}. Please try again.")
 
 async def handle_no_response(update: Update, context):
     """Handle when user hasn't completed a task"""
     query = update.callback_query
-    await query.answer()
-    
-    syllabi = load_syllabi()
-    progress = load_progress()
-    
-    if not syllabi["current_field"]:
-        await query.edit_message_text("No active syllabus. Use /start to select one.")
-        return
+    _, syllabi = await asyncio.gather(query.answer(), aload_syllabi())
+    async with progress_transaction() as progress:
+        # Another tap on this message already changed progress; only its reply should go out
+        if _edit_pending(query):
+            return
+        if not syllabi["current_field"]:
+            _schedule_edit(query, "No active syllabus. Use /start to select one.")
+            return
         
-    current_field = syllabi["current_field"]
-    syllabus_progress = get_syllabus_progress(progress, current_field)
-    current_week = syllabus_progress["current_week"]
+        current_field = syllabi["current_field"]
+        syllabus_progress = get_syllabus_progress(progress, current_field)
+        current_week = syllabus_progress["current_week"]
     
-    try:
-        # Extend the due date by half the original interval (giving extra time)
-        interval = progress["global_settings"].get("reminder_interval", 7)
-        extension = max(3, interval // 2)  # At least 3 days, or half the interval
+        try:
+            # Extend the due date by half the original interval (giving extra time)
+            interval = progress["global_settings"].get("reminder_interval", 7)
+            extension = max(3, interval // 2)  # At least 3 days, or half the interval
         
-        if "due_date" in syllabus_progress:
-            due_date = datetime.fromisoformat(syllabus_progress["due_date"])
-            extended_date = due_date + timedelta(days=extension)
-            syllabus_progress["due_date"] = extended_date.isoformat()
-            save_progress(progress)
+            if "due_date" in syllabus_progress:
+                due_date = syllabus_progress["due_date"]
+                extended_date = due_date + timedelta(days=extension)
+                set_due_date(syllabus_progress, extended_date)
             
-            days_until = (extended_date - datetime.now()).days
+                days_until = days_until_due(syllabus_progress)
             
-            await query.edit_message_text(
-                f"No worries! 🚧 Keep working on:\n\n"
-                f"{syllabi['syllabi'][current_field]['tasks'][current_week-1]}\n\n"
-                f"Due date extended by {extension} days (now due in {days_until} days).\n"
-                f"Use /check again when ready. ⏳"
-            )
-        else:
-            await query.edit_message_text(
-                f"No worries! 🚧 Keep working on:\n\n"
-                f"{syllabi['syllabi'][current_field]['tasks'][current_week-1]}\n\n"
-                f"Use /check again when ready. ⏳"
-            )
-    except Exception as e:
-        await query.edit_message_text(f"Error updating due date: {str(e)}. Please try again.")
+                _schedule_edit(query,
+                    f"No worries! 🚧 Keep working on:\n\n"
+                    f"{_SYLLABI_CACHE['tasks'][current_field][current_week-1]}\n\n"
+                    f"Due date extended by {extension} days (now due in {days_until} days).\n"
+                    f"Use /check again when ready. ⏳"
+                )
+            else:
+                _schedule_edit(query,
+                    f"No worries! 🚧 Keep working on:\n\n"
+                    f"{_SYLLABI_CACHE['tasks'][current_field][current_week-1]}\n\n"
+                    f"Use /check again when ready. ⏳"
+                )
+        except Exception as e:
+            _schedule_edit(query, f"Error updating due date: {str(e)}. Please try again.")
 
 async def handle_reset_yes(update: Update, context):
     """Handle reset confirmation"""
     query = update.callback_query
-    await query.answer()
-    
-    syllabi = load_syllabi()
-    progress = load_progress()
-    
-    if not syllabi["current_field"]:
-        await query.edit_message_text("No active syllabus. Use /start to select one.")
-        return
+    _, syllabi = await asyncio.gather(query.answer(), aload_syllabi())
+    async with progress_transaction() as progress:
+        # Another tap on this message already changed progress; only its reply should go out
+        if _edit_pending(query):
+            return
+        if not syllabi["current_field"]:
+            _schedule_edit(query, "No active syllabus. Use /start to select one.")
+            return
         
-    current_field = syllabi["current_field"]
+        current_field = syllabi["current_field"]
     
-    try:
-        # Reset progress for this syllabus
-        if "syllabi_progress" in progress and current_field in progress["syllabi_progress"]:
-            progress["syllabi_progress"][current_field] = {
-                "current_week": 1,
-                "completed_weeks": [],
-                "start_date": datetime.now().isoformat(),
-                "due_date": (datetime.now() + timedelta(days=progress["global_settings"].get("reminder_interval", 7))).isoformat()
-            }
-            save_progress(progress)
+        try:
+            # Reset progress for this syllabus
+            if "syllabi_progress" in progress and current_field in progress["syllabi_progress"]:
+                progress["syllabi_progress"][current_field] = new_syllabus_progress(progress)
+                interval = progress["global_settings"].get("reminder_interval", 7)
             
-            await query.edit_message_text(
-                f"Progress reset! 🌱 Starting fresh with {current_field}:\n\n"
-                f"{syllabi['syllabi'][current_field]['tasks'][0]}\n\n"
-                f"Due in {progress['global_settings'].get('reminder_interval', 7)} days. Use /check when completed! 🚀"
-            )
-        else:
-            await query.edit_message_text("No progress found to reset. Use /start to begin.")
-    except Exception as e:
-        await query.edit_message_text(f"Error resetting progress: {str(e)}. Please try again.")
+                _schedule_edit(query,
+                    f"Progress reset! 🌱 Starting fresh with {current_field}:\n\n"
+                    f"{_SYLLABI_CACHE['tasks'][current_field][0]}\n\n"
+                    f"Due in {interval} days. Use /check when completed! 🚀"
+                )
+            else:
+                _schedule_edit(query, "No progress found to reset. Use /start to begin.")
+        except Exception as e:
+            _schedule_edit(query, f"Error resetting progress: {str(e)}. Please try again.")
 
 async def handle_reset_no(update: Update, context):
     """Handle reset cancellation"""
     query = update.callback_query
     await query.answer()
-    await query.edit_message_text("Reset cancelled! 🚫 Continue with your current progress.")
+    _schedule_edit(query, "Reset cancelled! 🚫 Continue with your current progress.")
 
 # Daily check function to run with a job queue
-async def check_due_dates(context):
-    """Check if any tasks are due and send reminders"""
-    bot = context.bot
-    progress = load_progress()
-    syllabi = load_syllabi()
-    
+# Stand-in for "never" when no overdue reminder has been sent yet
+_EPOCH_SENTINEL = datetime(2000, 1, 1)
+
+# Reminder texts, filled in with str.format for the active field and task
+DUE_TODAY_MSG = (
+    "⏰ **Reminder**: Your current task is due today!\n\n"
+    "**{field}**: {task}\n\n"
+    "Use /check to mark as completed."
+)
+DUE_TOMORROW_MSG = (
+    "📅 **Reminder**: Your current task is due tomorrow!\n\n"
+    "**{field}**: {task}\n\n"
+    "Use /check to mark as completed when you're done."
+)
+OVERDUE_MSG = (
+    "⚠️ **Task Overdue**: Your current task is {days} days overdue!\n\n"
+    "**{field}**: {task}\n\n"
+    "Use /check to mark as completed or /set_interval to adjust your schedule."
+)
+
+def _reminder_message(progress, syllabi, now):
+    """(text, overdue) for today's reminder about the active task, or None if nothing is due"""
+    settings = progress["global_settings"]
     # Skip if reminders are disabled
-    if not progress["global_settings"].get("reminders_enabled", True):
-        return
+    if not settings.get("reminders_enabled", True):
+        return None
         
     # Skip if no active syllabus
-    if not syllabi["current_field"] or syllabi["syllabi"][syllabi["current_field"]].get("paused", False):
-        return
+    current_field = _active_field(syllabi)
+    if not current_field:
+        return None
     
-    current_field = syllabi["current_field"]
     syllabus_progress = get_syllabus_progress(progress, current_field)
     
     # Check if we have a due date
-    if "due_date" in syllabus_progress:
-        due_date = datetime.fromisoformat(syllabus_progress["due_date"])
-        now = datetime.now()
-        
-        # Calculate days remaining
-        days_remaining = (due_date - now).days
-        
-        # If due today or tomorrow, send a reminder
-        if 0 <= days_remaining <= 1:
-            current_week = syllabus_progress["current_week"]
-            if current_week <= len(syllabi["syllabi"][current_field]["tasks"]):
-                current_task = syllabi["syllabi"][current_field]["tasks"][current_week - 1]
-                
-                # Get the chat ID from context.job.data
-                chat_id = context.job.data
-                
-                # Send reminder
-                if days_remaining == 0:
-                    message = (
-                        f"⏰ **Reminder**: Your current task is due today!\n\n"
-                        f"**{current_field}**: {current_task}\n\n"
-                        f"Use /check to mark as completed."
-                    )
-                else:  # days_remaining == 1
-                    message = (
-                        f"📅 **Reminder**: Your current task is due tomorrow!\n\n"
-                        f"**{current_field}**: {current_task}\n\n"
-                        f"Use /check to mark as completed when you're done."
-                    )
-                
-                await bot.send_message(chat_id=chat_id, text=message, parse_mode='Markdown')
-        
-        # If overdue, send a reminder every 3 days
-        elif days_remaining < 0:
-            # Check if we've sent a reminder recently (every 3 days)
-            last_reminder = datetime.fromisoformat(progress["global_settings"].get("last_reminder", "2000-01-01T00:00:00"))
-            if (now - last_reminder).days >= 3:
-                current_week = syllabus_progress["current_week"]
-                if current_week <= len(syllabi["syllabi"][current_field]["tasks"]):
-                    current_task = syllabi["syllabi"][current_field]["tasks"][current_week - 1]
-                    
-                    # Get the chat ID
-                    chat_id = context.job.data
-                    
-                    # Send overdue reminder
-                    message = (
-                        f"⚠️ **Task Overdue**: Your current task is {abs(days_remaining)} days overdue!\n\n"
-                        f"**{current_field}**: {current_task}\n\n"
-                        f"Use /check to mark as completed or /set_interval to adjust your schedule."
-                    )
-                    
-                    await bot.send_message(chat_id=chat_id, text=message, parse_mode='Markdown')
-                    
-                    # Update last reminder time
-                    progress["global_settings"]["last_reminder"] = now.isoformat()
-                    save_progress(progress)
+    if "due_date" not in syllabus_progress:
+        return None
+    
+    # Calculate days remaining; on most days the task isn't due yet and we stop here
+    days_remaining = days_until_due(syllabus_progress)
+    if days_remaining > 1:
+        return None
+    
+    # If overdue, send a reminder every 3 days
+    last_reminder = settings.get("last_reminder", _EPOCH_SENTINEL)
+    if days_remaining < 0 and (now - last_reminder).days < 3:
+        return None
+    
+    tasks = _SYLLABI_CACHE["tasks"][current_field]
+    current_week = syllabus_progress["current_week"]
+    if current_week > len(tasks):
+        return None
+    current_task = tasks[current_week - 1]
+    
+    # If due today or tomorrow, send a reminder
+    if days_remaining == 0:
+        return DUE_TODAY_MSG.format(field=current_field, task=current_task), False
+    if days_remaining == 1:
+        return DUE_TOMORROW_MSG.format(field=current_field, task=current_task), False
+    return OVERDUE_MSG.format(days=abs(days_remaining), field=current_field, task=current_task), True
+
+async def check_due_dates(context):
+    """Check if any tasks are due and send the reminder to every subscribed chat"""
+    state = await aload_state()
+    chats = state["subscribed_chats"]
+    if not chats:
+        return
+    
+    # Progress is shared by all chats, so the reminder is worked out once per sweep
+    now = datetime.now()
+    progress = state["progress"]
+    reminder = _reminder_message(progress, state["syllabi"], now)
+    if reminder is None:
+        return
+    message, overdue = reminder
+    
+    # Send to every chat at once; the rate limiter keeps the burst within Telegram's limits
+    chat_ids = sorted(chats)
+    results = await asyncio.gather(
+        *(context.bot.send_message(chat_id=chat_id, text=message, parse_mode='Markdown') for chat_id in chat_ids),
+        return_exceptions=True,
+    )
+    for chat_id, result in zip(chat_ids, results):
+        if isinstance(result, Forbidden):
+            # The user blocked the bot or left the chat; stop reminding them
+            logger.info(f"Unsubscribing chat {chat_id} from reminders")
+            unsubscribe_chat(chat_id)
+        elif isinstance(result, Exception):
+            logger.error(f"Failed to send reminder to chat {chat_id}: {result}")
+    
+    # Only start the 3-day overdue pause once someone has actually been reminded
+    if overdue and any(not isinstance(result, Exception) for result in results):
+        progress["global_settings"]["last_reminder"] = now
+        save_progress(progress)
 
 # Set up the reminder job
-def setup_reminder_job(application, chat_id):
-    """Set up the daily reminder check job"""
+def setup_reminder_job(application):
+    """Set up the daily reminder sweep over all subscribed chats"""
     if application.job_queue is None:
         logger.warning("Job queue is not available. Reminders will not be sent. Install with: pip install 'python-telegram-bot[job-queue]'")
         return
@@ -874,51 +1190,96 @@ def setup_reminder_job(application, chat_id):
         check_due_dates,
         time=time(hour=10, minute=0),  # Send at 10:00 AM
         days=(0, 1, 2, 3, 4, 5, 6),  # Every day
-        data=chat_id
+        name="reminders"
     )
 
 async def echo(update: Update, context):
     """Echo the user message. 🗣️"""
     await update.message.reply_text(f"You said: {update.message.text} 🎤\n\nUse /help to see available commands.")
 
-async def button_handler(update: Update, context):
-    """Handle button clicks. 🔘"""
-    query = update.callback_query
-    
-    if query.data.startswith("start_"):
-        await start_syllabus_callback(update, context)
-    elif query.data.startswith("show_"):
-        await show_syllabus_callback(update, context)
-    elif query.data.startswith("switch_"):
-        await switch_syllabus_callback(update, context)
-    elif query.data.startswith("pause_"):
-        await pause_syllabus_callback(update, context)
-    elif query.data.startswith("resume_"):
-        await resume_syllabus_callback(update, context)
-    elif query.data == "yes":
-        await handle_yes_response(update, context)
-    elif query.data == "no":
-        await handle_no_response(update, context)
-    elif query.data == "reset_yes":
-        await handle_reset_yes(update, context)
-    elif query.data == "reset_no":
-        await handle_reset_no(update, context)
+# Callback data patterns and their handlers, keyed by the regex group that matches
+CALLBACK_PATTERNS = (
+    ("start", r"start_", start_syllabus_callback),
+    ("show", r"show_", show_syllabus_callback),
+    ("switch", r"switch_", switch_syllabus_callback),
+    ("pause", r"pause_", pause_syllabus_callback),
+    ("resume", r"resume_", resume_syllabus_callback),
+    ("yes", r"yes$", handle_yes_response),
+    ("no", r"no$", handle_no_response),
+    ("reset_yes", r"reset_yes$", handle_reset_yes),
+    ("reset_no", r"reset_no$", handle_reset_no),
+)
+CALLBACK_HANDLERS = {name: callback for name, _, callback in CALLBACK_PATTERNS}
+# One compiled alternation, so an update is matched once instead of against each handler in turn
+CALLBACK_RE = re.compile("^(?:" + "|".join(f"(?P<{name}>{pattern})" for name, pattern, _ in CALLBACK_PATTERNS) + ")")
+
+async def route_callback(update: Update, context):
+    """Run the handler for whichever callback pattern matched"""
+    await CALLBACK_HANDLERS[context.match.lastgroup](update, context)
 
 # Global error handler
 async def error_handler(update, context):
-    """Log errors and send a message to the developer."""
-    logger.error(f"Exception while handling an update: {context.error}")
-    logger.error(traceback.format_exc())
+    """Log errors raised by any handler and tell the user what went wrong."""
+    error = context.error
+    for error_type, log_prefix, reply in ERROR_REPLIES:
+        if isinstance(error, error_type):
+            logger.error(f"{log_prefix}: {str(error)}")
+            break
+    else:
+        # The traceback is only formatted if the record is actually emitted
+        logger.error("Exception while handling an update: %s", error, exc_info=error)
+        reply = "⚠️ An unexpected error occurred. Please try again later or contact the administrator."
     
     # Try to notify the user
     if update and update.effective_message:
-        await update.effective_message.reply_text(
-            "Sorry, an error occurred. Please try again or use /help."
-        )
+        await update.effective_message.reply_text(reply)
+
+async def post_init(application):
+    """Load the state and start background tasks once the application is running"""
+    # Read state.json once up front so the first update is served from memory
+    await aload_state()
+    if application.job_queue is not None:
+        application.job_queue.run_repeating(flush_state_job, interval=FLUSH_INTERVAL, name="flush_state")
+    else:
+        application.bot_data["flusher"] = asyncio.create_task(_flush_loop())
+
+async def post_stop(application):
+    """Send replies still waiting out the coalesce window while the bot can still make requests"""
+    await asyncio.gather(*_edit_tasks, return_exceptions=True)
+
+async def post_shutdown(application):
+    """Stop background tasks and write out any unsaved changes"""
+    flusher = application.bot_data.pop("flusher", None)
+    if flusher:
+        flusher.cancel()
+    try:
+        flush_pending_writes()
+    finally:
+        # Wait for the writer thread so nothing is lost when the process exits
+        await asyncio.to_thread(_write_queue.join)
+
+def _rate_limiter():
+    """Throttle outgoing requests to Telegram's flood limits, or None if the extra isn't installed"""
+    try:
+        # Retry a message a few times if Telegram still answers with RetryAfter
+        return AIORateLimiter(max_retries=3)
+    except RuntimeError:
+        logger.warning("Rate limiter is not available. Sends will not be throttled. Install with: pip install 'python-telegram-bot[rate-limiter]'")
+        return None
 
 def main():
     """Start the bot. 🚀"""
-    application = Application.builder().token(BOT_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(_bot_token())
+        .rate_limiter(_rate_limiter())
+        # The updater polls in its own task; let handlers for different updates run side by side
+        .concurrent_updates(True)
+        .post_init(post_init)
+        .post_stop(post_stop)
+        .post_shutdown(post_shutdown)
+        .build()
+    )
 
     # Add handlers 🎛️
     application.add_handler(CommandHandler("start", start))
@@ -934,18 +1295,18 @@ def main():
     application.add_handler(CommandHandler("toggle_reminders", toggle_reminders))
     application.add_handler(CommandHandler("set_interval", set_reminder_interval))
     application.add_handler(CommandHandler("statistics", show_statistics))
-    application.add_handler(CallbackQueryHandler(button_handler))
+    application.add_handler(CallbackQueryHandler(route_callback, pattern=CALLBACK_RE))
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, echo))
     
     # Add error handler
     application.add_error_handler(error_handler)
     
-    # Set up reminder for your chat ID (replace with your actual Telegram ID)
-    YOUR_CHAT_ID = 123456789  # Replace with your actual Telegram ID
-    setup_reminder_job(application, YOUR_CHAT_ID)
+    # One daily job sends reminders to every chat that has used /start
+    setup_reminder_job(application)
 
     # Start the Bot 🎬
-    application.run_polling(allowed_updates=Update.ALL_TYPES)
+    # Long polling: getUpdates waits up to 30s server-side, so an idle bot makes few requests
+    application.run_polling(poll_interval=0.0, timeout=30, allowed_updates=Update.ALL_TYPES)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file